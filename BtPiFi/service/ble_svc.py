@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
 
 import asyncio
-import dbus_next.aio
-from dbus_next import BusType, Variant, DBusError
-# Import ServiceInterface, method, dbus_property, PropertyAccess
-from dbus_next.service import ServiceInterface, method, dbus_property, PropertyAccess
+import logging
+import os
+import signal
+# dbus-fast is the maintained, API-compatible fork of dbus-next with a
+# C-accelerated marshaller - same class/method names, faster Variant and
+# message encoding on the GetManagedObjects/property hot path.
+from dbus_fast.aio import MessageBus
+from dbus_fast import BusType, Variant, DBusError
+from dbus_fast.service import ServiceInterface, method, dbus_property
+from dbus_fast.constants import PropertyAccess
 import subprocess
+import shutil
 import json
-from concurrent.futures import ThreadPoolExecutor # Included based on user's working version (080b505)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import traceback
 import time # Import the time module for sleep
 # sys and os imports removed as per user's working version
@@ -20,11 +30,13 @@ CHAR_RW_PATH = SERVICE_PATH + "/char0"    # Read/Write Char
 CHAR_SCAN_PATH = SERVICE_PATH + "/char1"  # WiFi Scan Char
 CHAR_SSID_PATH = SERVICE_PATH + "/char2"  # Set SSID Char (NEW)
 CHAR_PSK_PATH = SERVICE_PATH + "/char3"   # Set PSK Char (NEW)
+CHAR_PROVISION_PATH = SERVICE_PATH + "/char4" # One-shot Provision Char
 # Descriptor Paths
 DESC_RW_PATH = CHAR_RW_PATH + "/desc0"
 DESC_SCAN_PATH = CHAR_SCAN_PATH + "/desc0"
 DESC_SSID_PATH = CHAR_SSID_PATH + "/desc0" # (NEW)
 DESC_PSK_PATH = CHAR_PSK_PATH + "/desc0"   # (NEW)
+DESC_PROVISION_PATH = CHAR_PROVISION_PATH + "/desc0"
 # Advertisement Path (Using path from user's working version)
 ADVERTISEMENT_PATH = "/com/automationwise/btpifi/advertisement0"
 
@@ -35,6 +47,7 @@ CHAR_READ_WRITE_UUID = "133934e1-01f5-4054-a88f-0136e064c49e"
 WIFI_SCAN_UUID = "133934e2-01f5-4054-a88f-0136e064c49e"
 WIFI_SET_SSID_UUID = "133934e3-01f5-4054-a88f-0136e064c49e"
 WIFI_SET_PSK_UUID = "133934e4-01f5-4054-a88f-0136e064c49e"
+WIFI_PROVISION_UUID = "133934e6-01f5-4054-a88f-0136e064c49e"
 # Descriptor UUID
 USER_DESC_UUID = "2901" # Characteristic User Description
 
@@ -45,8 +58,71 @@ DEFAULT_DEVICE_NAME = "BtPiFi-Setup"
 WIFI_INTERFACE = "wlan0"
 # Static DEVICE_NAME constant removed, will use dynamic name variable
 
+# How long a finished WiFi scan result stays valid for repeated BLE reads.
+# Bluetooth clients commonly issue several consecutive reads (segmented
+# transfers, MTU-change retries); the WiFi environment doesn't change
+# meaningfully within this window.
+SCAN_CACHE_TTL = 15.0
+# NetworkManager scan results younger than this (ms, CLOCK_BOOTTIME) are
+# served without forcing a radio re-probe.
+SCAN_FRESH_MS = 30_000
+# Writing this to the RW characteristic forces the next scan to re-probe.
+RESCAN_TRIGGER = b"rescan"
+
+# Set by the RW characteristic, consumed (and cleared) by the next scan.
+_force_rescan = False
+
+# Process-wide system-bus connection; everything shares one authenticated
+# socket instead of paying a SASL handshake per connect.
+_bus = None
+_bus_lock = asyncio.Lock()
+
+# The only BlueZ adapter methods we ever call; building the proxy from this
+# static node skips a second introspect roundtrip (and its XML parse) when
+# the adapter was located via GetManagedObjects.
+_ADAPTER_NODE_XML = """
+<node>
+  <interface name="org.bluez.GattManager1">
+    <method name="RegisterApplication">
+      <arg name="application" type="o" direction="in"/>
+      <arg name="options" type="a{sv}" direction="in"/>
+    </method>
+    <method name="UnregisterApplication">
+      <arg name="application" type="o" direction="in"/>
+    </method>
+  </interface>
+  <interface name="org.bluez.LEAdvertisingManager1">
+    <method name="RegisterAdvertisement">
+      <arg name="advertisement" type="o" direction="in"/>
+      <arg name="options" type="a{sv}" direction="in"/>
+    </method>
+    <method name="UnregisterAdvertisement">
+      <arg name="advertisement" type="o" direction="in"/>
+    </method>
+  </interface>
+</node>
+"""
+
+async def get_bus():
+    global _bus
+    async with _bus_lock:
+        if _bus is None or not _bus.connected:
+            _bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        return _bus
+
+# Resolve the nmcli binary once; spawning with an absolute path skips the
+# PATH walk on every fallback scan.
+NMCLI = shutil.which("nmcli")
+
+# Write-size caps, checked before any allocation or decoding. 802.11 caps an
+# SSID at 32 bytes; a WPA-PSK is at most 63 printable chars / 64 hex digits.
+MAX_SSID_LEN = 32
+MAX_PSK_LEN = 64
+MAX_RW_VALUE_LEN = 512
+
 # BlueZ & D-Bus Constants
 BLUEZ_SERVICE = 'org.bluez'
+DEFAULT_ADAPTER_PATH = '/org/bluez/hci0'
 GATT_MANAGER_IFACE = 'org.bluez.GattManager1'
 DBUS_OM_IFACE =      'org.freedesktop.DBus.ObjectManager'
 DBUS_PROP_IFACE =    'org.freedesktop.DBus.Properties'
@@ -56,6 +132,15 @@ GATT_DESC_IFACE =    'org.bluez.GattDescriptor1'
 LE_ADVERTISING_MANAGER_IFACE = 'org.bluez.LEAdvertisingManager1'
 LE_ADVERTISEMENT_IFACE = 'org.bluez.LEAdvertisement1'
 
+# NetworkManager D-Bus Constants
+NM_SERVICE = 'org.freedesktop.NetworkManager'
+NM_PATH = '/org/freedesktop/NetworkManager'
+NM_IFACE = 'org.freedesktop.NetworkManager'
+NM_WIRELESS_IFACE = 'org.freedesktop.NetworkManager.Device.Wireless'
+NM_AP_IFACE = 'org.freedesktop.NetworkManager.AccessPoint'
+
+log = logging.getLogger('btpifi.ble')
+
 
 # --- Helper Functions ---
 
@@ -68,106 +153,202 @@ def get_dynamic_device_name(interface: str, default_name: str) -> str:
     """
     mac_path = f"/sys/class/net/{interface}/address"
     try:
-        with open(mac_path, 'r') as f:
-            mac_address = f.readline().strip()
+        # Raw fd read: no TextIOWrapper/buffer allocation for an 18-byte file
+        fd = os.open(mac_path, os.O_RDONLY)
+        try:
+            raw = os.read(fd, 32)
+        finally:
+            os.close(fd)
+        mac_address = raw.decode("ascii", errors="replace").strip()
         # MAC format: aa:bb:cc:dd:ee:ff
         if len(mac_address) == 17 and mac_address.count(':') == 5:
-            # Remove colons and take last 4 chars (last 2 bytes)
-            mac_suffix = mac_address.replace(":", "")[-4:].upper()
+            # Canonical aa:bb:cc:dd:ee:ff - the last two bytes sit at fixed
+            # offsets, so slice them out instead of rebuilding the whole string
+            mac_suffix = (mac_address[12:14] + mac_address[15:17]).upper()
             device_name = f"BtPiFi-{mac_suffix}"
-            print(f"Using dynamic device name: {device_name} (from {interface} MAC: {mac_address})")
+            log.info(f"Using dynamic device name: {device_name} (from {interface} MAC: {mac_address})")
             return device_name
         else:
-            print(f"Warning: Could not parse MAC address '{mac_address}' from {mac_path}.")
+            log.warning(f"Could not parse MAC address '{mac_address}' from {mac_path}.")
     except FileNotFoundError:
-        print(f"Warning: Could not find MAC address file: {mac_path}. Interface '{interface}' down or doesn't exist?")
+        log.warning(f"Could not find MAC address file: {mac_path}. Interface '{interface}' down or doesn't exist?")
     except Exception as e:
-        print(f"Warning: Error reading MAC address from {mac_path}: {e}")
+        log.warning(f"Error reading MAC address from {mac_path}: {e}")
 
-    print(f"Falling back to default device name: {default_name}")
+    log.info(f"Falling back to default device name: {default_name}")
     return default_name
 
-# (run_wifi_scan function as provided by user)
-def run_wifi_scan():
+async def _run_scan_cmd(cmd, timeout):
+    """Run a scan helper command without blocking the event loop.
+
+    Mirrors subprocess.run(check=True, capture_output=True) semantics so the
+    callers' error handling carries over unchanged."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, stdout, stderr.decode("utf-8", errors="replace"))
+    # Raw bytes: callers decode only the lines they keep
+    return stdout
+
+async def _scan_networkmanager(bus, force=False):
+    """Scan by asking NetworkManager directly over D-Bus.
+
+    Reuses the process's existing system-bus connection - no fork/exec, no
+    sudo, and typed replies instead of text parsing. Supersedes the 'iw'
+    subprocess fast path, since NM drives the same nl80211 scan itself."""
+    introspection = await bus.introspect(NM_SERVICE, NM_PATH)
+    nm = bus.get_proxy_object(NM_SERVICE, NM_PATH, introspection).get_interface(NM_IFACE)
+    device_path = await nm.call_get_device_by_ip_iface(WIFI_INTERFACE)
+    dev_introspection = await bus.introspect(NM_SERVICE, device_path)
+    wireless = bus.get_proxy_object(NM_SERVICE, device_path, dev_introspection).get_interface(NM_WIRELESS_IFACE)
+    last_scan = await wireless.get_last_scan()
+    # LastScan is CLOCK_BOOTTIME milliseconds; if NM scanned recently and no
+    # client demanded a fresh probe, its cached AP list is good enough and we
+    # skip the multi-second channel walk entirely.
+    now_ms = time.clock_gettime(time.CLOCK_BOOTTIME) * 1000.0
+    if not force and 0 < last_scan and now_ms - last_scan < SCAN_FRESH_MS:
+        log.debug("NetworkManager scan is fresh; skipping rescan")
+    else:
+        try:
+            await wireless.call_request_scan({})
+        except DBusError as e:
+            # NM rejects a request while a scan is already running; just wait
+            # for that one to land.
+            log.debug("RequestScan rejected (%s); waiting for scan in progress", e.text)
+        # LastScan moving is NetworkManager's signal that the scan finished.
+        deadline = time.monotonic() + 15.0
+        while await wireless.get_last_scan() == last_scan:
+            if time.monotonic() > deadline:
+                log.warning("Timed out waiting for NetworkManager scan; using current AP list")
+                break
+            await asyncio.sleep(0.5)
+    ssids = set()
+    for ap_path in await wireless.get_access_points():
+        try:
+            ap_introspection = await bus.introspect(NM_SERVICE, ap_path)
+            ap = bus.get_proxy_object(NM_SERVICE, ap_path, ap_introspection).get_interface(NM_AP_IFACE)
+            raw = await ap.get_ssid()
+        except DBusError:
+            continue # AP vanished between listing and reading it
+        if raw:
+            ssids.add(bytes(raw).decode("utf-8", errors="replace"))
+    return {"ssids": sorted(ssids)}
+
+def _encode_scan_payload(scan_result: dict) -> bytes:
+    """Serialize a scan result without a generic dict-encoder pass.
+
+    The payload only ever has two shapes - {"ssids": [...]} or
+    {"error": "..."} - so the outer object is a fixed template and
+    json.dumps is only needed to escape the inner value."""
+    error = scan_result.get("error")
+    if error is not None:
+        return b'{"error":' + json.dumps(error).encode() + b'}'
+    return (b'{"ssids":'
+            + json.dumps(scan_result["ssids"], separators=(",", ":")).encode()
+            + b'}')
+
+# Both serializers take the scan dict and return bytes, matching the D-Bus
+# 'ay' reply type with no further conversion.
+_dumps = orjson.dumps if orjson is not None else _encode_scan_payload
+
+# The fixed failure modes from _scan_nmcli, encoded once - serving one of
+# these is a dict lookup rather than a JSON encode.
+_STATIC_ERROR_PAYLOADS = {
+    err: _encode_scan_payload({"error": err})
+    for err in ("nmcli not found", "WiFi is disabled",
+                "NetworkManager is not running", "WiFi list timed out")
+}
+
+async def run_wifi_scan(bus=None):
+    # Read the rescan request here and clear it only once a backend has
+    # honored it; clearing it inside a backend that then fails would drop
+    # the client's request on the floor before the fallback runs.
+    global _force_rescan
+    force = _force_rescan
+    if bus is not None:
+        try:
+            result = await _scan_networkmanager(bus, force)
+            _force_rescan = False
+            log.debug("Found SSIDs (NetworkManager): %s", result["ssids"])
+            return result
+        except Exception as e:
+            log.warning(f"NetworkManager D-Bus scan failed ({e}), falling back to nmcli")
+    result = await _scan_nmcli(force)
+    if "error" not in result:
+        _force_rescan = False
+    return result
+
+# (nmcli fallback, originally the only scan path)
+async def _scan_nmcli(force=False):
     ssids = []
     try:
-        rescan_cmd = ["sudo", "nmcli", "dev", "wifi", "rescan"]
-        print(f"Running command: {' '.join(rescan_cmd)}")
-        subprocess.run(rescan_cmd, check=True, timeout=10, capture_output=True)
-        scan_wait_time = 8
-        print(f"Waiting {scan_wait_time} seconds for scan results...")
-        time.sleep(scan_wait_time)
-        list_cmd = ["nmcli", "-t", "-f", "SSID", "dev", "wifi", "list"]
-        print(f"Running command: {' '.join(list_cmd)}")
-        result = subprocess.run(list_cmd, capture_output=True, text=True, check=True, timeout=10)
-        output = result.stdout.strip()
-        print(f"Scan output:\n{output}")
-        if output:
-            found_ssids = set(filter(None, output.split('\n')))
-            ssids = sorted(list(found_ssids))
+        # 'wifi list --rescan auto' rescans and returns results in a single
+        # nmcli process; the old rescan + fixed 8s sleep + list sequence cost
+        # two forks and always waited the full sleep.
+        if NMCLI is None:
+            return {"error": "nmcli not found"}
+        rescan = "yes" if force else "auto"
+        # -g prints raw SSIDs one per line; terse -t -f output would escape
+        # ':' and '\\' and corrupt matching SSIDs
+        list_cmd = [NMCLI, "-g", "SSID", "dev", "wifi", "list", "--rescan", rescan]
+        log.debug("Running command: %s", list_cmd)
+        stdout = await _run_scan_cmd(list_cmd, timeout=20)
+        log.debug("Scan output:\n%s", stdout)
+        # Dedup on raw bytes lines, then decode only the survivors; a dense
+        # AP environment can emit several KB we would otherwise decode whole
+        ssids = sorted(s.decode("utf-8", errors="replace")
+                       for s in {line for line in stdout.splitlines() if line})
     except FileNotFoundError: return {"error": "nmcli not found"}
     except subprocess.CalledProcessError as e:
         stderr_output = e.stderr.strip() if e.stderr else "No stderr output"
-        print(f"Error running nmcli: {e}\nStderr: {stderr_output}")
+        log.error(f"Error running nmcli: {e}\nStderr: {stderr_output}")
         if "wifi is disabled" in stderr_output.lower(): return {"error": "WiFi is disabled"}
         if "NetworkManager is not running" in stderr_output: return {"error": "NetworkManager is not running"}
         return {"error": f"nmcli failed: {stderr_output[:100]}"}
-    except subprocess.TimeoutExpired as e:
-        cmd_name = 'rescan' if e.cmd == rescan_cmd else 'list'
-        print(f"Error: nmcli {cmd_name} command timed out.")
-        return {"error": f"WiFi {cmd_name} timed out"}
+    except subprocess.TimeoutExpired:
+        log.error("nmcli list command timed out.")
+        return {"error": "WiFi list timed out"}
     except Exception as e:
-        print(f"An unexpected error occurred during WiFi scan: {e}")
+        log.error(f"An unexpected error occurred during WiFi scan: {e}")
         return {"error": f"Unexpected scan error: {str(e)}"}
-    print(f"Found SSIDs: {ssids}")
+    log.debug("Found SSIDs: %s", ssids)
     return {"ssids": ssids}
 
 # --- D-Bus Object Implementations ---
 # Structure based on user's working code (080b505)
 
-class Application(ServiceInterface):
-    """ Object Manager implementation """
+class Application:
+    """ Registry of the exported GATT objects.
+
+    dbus-fast answers org.freedesktop.DBus.ObjectManager.GetManagedObjects
+    itself for any prefix of the exported tree (a hand-rolled handler here
+    would just be shadowed by it), so this only tracks the objects for
+    setup and teardown. """
+    __slots__ = ('bus', 'path_prefix', 'service_objects')
     def __init__(self, bus, path_prefix):
-        super().__init__(DBUS_OM_IFACE)
         self.bus = bus
         self.path_prefix = path_prefix
         self.service_objects = {}
-    def add_object(self, path, instance): self.service_objects[path] = instance
+    def add_object(self, path, instance):
+        self.service_objects[path] = instance
+    def add_objects(self, instances):
+        # Batch registration: one dict update instead of a call per object.
+        self.service_objects.update((obj.PATH, obj) for obj in instances)
     def remove_object(self, path):
-        if path in self.service_objects: del self.service_objects[path]
-    def _get_object_properties(self, instance):
-        props = {}
-        if isinstance(instance, BleService):
-            props['UUID'] = Variant('s', instance.uuid)
-            props['Primary'] = Variant('b', instance.primary)
-            props['Characteristics'] = Variant('ao', instance.characteristic_paths)
-        elif isinstance(instance, BleCharacteristic):
-            props['UUID'] = Variant('s', instance.uuid)
-            props['Flags'] = Variant('as', instance.flags)
-            props['Service'] = Variant('o', instance.service_path)
-            props['Descriptors'] = Variant('ao', instance.descriptor_paths)
-        elif isinstance(instance, BleDescriptor):
-            props['UUID'] = Variant('s', instance.uuid)
-            props['Flags'] = Variant('as', instance.flags)
-            props['Characteristic'] = Variant('o', instance.characteristic_path)
-        return props
-    @method()
-    def GetManagedObjects(self) -> 'a{oa{sa{sv}}}':
-        print("GetManagedObjects called")
-        managed_objects_dict = {}
-        for path, instance in self.service_objects.items():
-            gatt_props = self._get_object_properties(instance)
-            # Using instance.name (interface name) as key, as per user's working version
-            if gatt_props and hasattr(instance, 'name'):
-                managed_objects_dict[path] = { instance.name: gatt_props }
-            else:
-                print(f"Warning: Could not get properties or name for object at {path}")
-                managed_objects_dict[path] = {}
-        return managed_objects_dict
+        if path in self.service_objects:
+            del self.service_objects[path]
 
 class BleService(ServiceInterface):
     """ Represents the GATT Service """
     PATH = SERVICE_PATH # Class variable path
+    __slots__ = ('uuid', 'primary', 'characteristic_paths', '_target_ssid',
+                 '_target_psk', '_props_cache')
     def __init__(self, uuid: str, primary: bool):
         super().__init__(GATT_SERVICE_IFACE)
         self.uuid = uuid
@@ -175,84 +356,117 @@ class BleService(ServiceInterface):
         self.characteristic_paths = []
         self._target_ssid = None
         self._target_psk = None
+        # Built once; the 'ao' Variant aliases characteristic_paths so later
+        # add_characteristic_path calls are still reflected on marshal.
+        self._props_cache = {
+            'UUID': Variant('s', uuid),
+            'Primary': Variant('b', primary),
+            'Characteristics': Variant('ao', self.characteristic_paths),
+        }
 
     @dbus_property(access=PropertyAccess.READ)
-    def UUID(self) -> 's': return self.uuid
+    def UUID(self) -> 's': return self._props_cache['UUID'].value
     @dbus_property(access=PropertyAccess.READ)
-    def Primary(self) -> 'b': return self.primary
+    def Primary(self) -> 'b': return self._props_cache['Primary'].value
     @dbus_property(access=PropertyAccess.READ)
-    def Characteristics(self) -> 'ao': return self.characteristic_paths
+    def Characteristics(self) -> 'ao': return self._props_cache['Characteristics'].value
     def add_characteristic_path(self, path: str):
         if path not in self.characteristic_paths: self.characteristic_paths.append(path)
 
 class BleCharacteristic(ServiceInterface):
     """ Base class for GATT Characteristics """
     # PATH defined in subclasses
+    __slots__ = ('uuid', 'flags', '_flags_set', 'service_path',
+                 'descriptor_paths', '_value', '_cached_bytes', '_props_cache')
     def __init__(self, interface_name, uuid: str, flags: list[str], service_path: str):
         super().__init__(interface_name)
         self.uuid = uuid
         self.flags = flags
+        self._flags_set = frozenset(flags) # O(1) checks on the read/write path
         self.service_path = service_path
         self.descriptor_paths = []
         self._value = bytearray()
+        self._cached_bytes = None # bytes(self._value), rebuilt after writes
         # _notifying removed as per user's working version base
+        self._props_cache = {
+            'UUID': Variant('s', uuid),
+            'Flags': Variant('as', flags),
+            'Service': Variant('o', service_path),
+            'Descriptors': Variant('ao', self.descriptor_paths),
+        }
 
     @dbus_property(access=PropertyAccess.READ)
-    def UUID(self) -> 's': return self.uuid
+    def UUID(self) -> 's': return self._props_cache['UUID'].value
     @dbus_property(access=PropertyAccess.READ)
-    def Flags(self) -> 'as': return self.flags
+    def Flags(self) -> 'as': return self._props_cache['Flags'].value
     @dbus_property(access=PropertyAccess.READ)
-    def Service(self) -> 'o': return self.service_path
+    def Service(self) -> 'o': return self._props_cache['Service'].value
     @dbus_property(access=PropertyAccess.READ)
-    def Descriptors(self) -> 'ao': return self.descriptor_paths
+    def Descriptors(self) -> 'ao': return self._props_cache['Descriptors'].value
     def add_descriptor_path(self, path: str):
         if path not in self.descriptor_paths: self.descriptor_paths.append(path)
     @method()
     async def ReadValue(self, options: 'a{sv}') -> 'ay':
-        print(f"Default ReadValue called for {self.uuid}. Override in subclass.")
-        if 'read' not in self.flags: raise DBusError('org.bluez.Error.NotPermitted', 'Read not permitted')
+        log.debug("Default ReadValue called for %s. Override in subclass.", self.uuid)
+        if 'read' not in self._flags_set: raise DBusError('org.bluez.Error.NotPermitted', 'Read not permitted')
         # Offset handling removed as per user's working version base
-        return bytes(self._value)
+        if self._cached_bytes is None:
+            self._cached_bytes = bytes(self._value)
+        return self._cached_bytes
     @method()
     async def WriteValue(self, value: 'ay', options: 'a{sv}'):
-        print(f"Default WriteValue called for {self.uuid}. Override in subclass.")
-        if 'write' not in self.flags: raise DBusError('org.bluez.Error.NotPermitted', 'Write not permitted')
+        log.debug("Default WriteValue called for %s. Override in subclass.", self.uuid)
+        if 'write' not in self._flags_set: raise DBusError('org.bluez.Error.NotPermitted', 'Write not permitted')
         # Offset handling removed as per user's working version base
         self._value = bytearray(value)
-        print(f"Wrote {len(value)} bytes.")
+        self._cached_bytes = None
+        log.debug("Wrote %d bytes.", len(value))
+    # Sync handlers: neither ever awaits, so skip the coroutine scheduling
     @method()
-    async def StartNotify(self): raise DBusError('org.bluez.Error.NotSupported', 'Notify not supported')
+    def StartNotify(self): raise DBusError('org.bluez.Error.NotSupported', 'Notify not supported')
     @method()
-    async def StopNotify(self): pass
+    def StopNotify(self): pass
 
 class BleDescriptor(ServiceInterface):
     """ Base class for GATT Descriptors """
     # PATH defined in subclasses
+    __slots__ = ('uuid', 'flags', '_flags_set', 'characteristic_path',
+                 '_value', '_cached_bytes', '_props_cache')
     def __init__(self, interface_name, uuid: str, flags: list[str], characteristic_path: str):
         super().__init__(interface_name)
         self.uuid = uuid
         self.flags = flags
+        self._flags_set = frozenset(flags)
         self.characteristic_path = characteristic_path
         self._value = bytearray()
+        self._cached_bytes = None # bytes(self._value), rebuilt after writes
+        self._props_cache = {
+            'UUID': Variant('s', uuid),
+            'Flags': Variant('as', flags),
+            'Characteristic': Variant('o', characteristic_path),
+        }
     @dbus_property(access=PropertyAccess.READ)
-    def UUID(self) -> 's': return self.uuid
+    def UUID(self) -> 's': return self._props_cache['UUID'].value
     @dbus_property(access=PropertyAccess.READ)
-    def Flags(self) -> 'as': return self.flags
+    def Flags(self) -> 'as': return self._props_cache['Flags'].value
     @dbus_property(access=PropertyAccess.READ)
-    def Characteristic(self) -> 'o': return self.characteristic_path
+    def Characteristic(self) -> 'o': return self._props_cache['Characteristic'].value
     @method()
     async def ReadValue(self, options: 'a{sv}') -> 'ay':
-        print(f"Default ReadValue called for Descriptor {self.uuid}. Override if needed.")
-        if 'read' not in self.flags: raise DBusError('org.bluez.Error.NotPermitted', 'Read not permitted')
+        log.debug("Default ReadValue called for Descriptor %s. Override if needed.", self.uuid)
+        if 'read' not in self._flags_set: raise DBusError('org.bluez.Error.NotPermitted', 'Read not permitted')
         # Offset handling removed as per user's working version base
-        return bytes(self._value)
+        if self._cached_bytes is None:
+            self._cached_bytes = bytes(self._value)
+        return self._cached_bytes
     @method()
     async def WriteValue(self, value: 'ay', options: 'a{sv}'):
-        print(f"Default WriteValue called for Descriptor {self.uuid}. Override if needed.")
-        if 'write' not in self.flags: raise DBusError('org.bluez.Error.NotPermitted', 'Write not permitted')
+        log.debug("Default WriteValue called for Descriptor %s. Override if needed.", self.uuid)
+        if 'write' not in self._flags_set: raise DBusError('org.bluez.Error.NotPermitted', 'Write not permitted')
         # Offset handling removed as per user's working version base
         self._value = bytearray(value)
-        print(f"Wrote {len(value)} bytes to descriptor.")
+        self._cached_bytes = None
+        log.debug("Wrote %d bytes to descriptor.", len(value))
 
 # --- Application Specific Characteristic Implementations ---
 # Structure based on user's working code (080b505)
@@ -260,92 +474,210 @@ class BleDescriptor(ServiceInterface):
 class ReadWriteCharacteristicImpl(BleCharacteristic):
     """ Simple Read/Write characteristic """
     PATH = CHAR_RW_PATH # Class variable path
+    # Encoded once at class definition; every instance starts from the same
+    # immutable bytes so ReadValue can hand it back without a copy
+    _DEFAULT_VALUE = b"Initial Value"
+    __slots__ = ()
     def __init__(self, service_path: str):
         super().__init__(GATT_CHRC_IFACE, CHAR_READ_WRITE_UUID, ["read", "write"], service_path)
-        self._value = bytearray("Initial Value", "utf-8")
+        self._value = self._DEFAULT_VALUE
     @method()
     async def ReadValue(self, options: 'a{sv}') -> 'ay':
-        print(">>> ReadWriteCharacteristicImpl.ReadValue called")
-        print(f"Client READ request received (RW Char). Sending value: {self._value.decode('utf-8', errors='replace')}")
-        return bytes(self._value) # Return directly
+        # Gate the decode behind the level check - it allocates a str per read
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"Client READ request received (RW Char). Sending value: {self._value.decode('utf-8', errors='replace')}")
+        return self._value # Already bytes, no per-read conversion
     @method()
     async def WriteValue(self, value: 'ay', options: 'a{sv}'):
-        print(">>> ReadWriteCharacteristicImpl.WriteValue called")
+        if len(value) > MAX_RW_VALUE_LEN:
+            raise DBusError('org.bluez.Error.InvalidValueLength', 'Payload too large')
         try:
-            received_string = bytes(value).decode("utf-8")
-            print(f"Client WRITE request received (RW Char). New value: {received_string}")
-            self._value = bytearray(value) # Update directly
+            data = bytes(value)
+            # Standalone decode: the UnicodeDecodeError below is what gates
+            # storing the value, so the validation must not live inside a
+            # log call where a logging cleanup could silently drop it
+            text = data.decode("utf-8")
+            log.debug("Client WRITE request received (RW Char). New value: %s", text)
+            if data == RESCAN_TRIGGER:
+                # Client explicitly wants fresh air - next scan re-probes
+                # instead of serving NM's cached AP list.
+                global _force_rescan
+                _force_rescan = True
+            self._value = data # Update directly
         except UnicodeDecodeError:
-            print("Error (RW Char): Received invalid UTF-8 data.")
+            log.error("RW Char: Received invalid UTF-8 data.")
 
 class WifiScanCharacteristicImpl(BleCharacteristic):
-    """ Read-only characteristic for WiFi scan results """
+    """ Characteristic for WiFi scan results.
+
+    Supports plain reads (full JSON payload) and notify subscriptions,
+    which stream one SSID per Value change so clients can stop early. """
     PATH = CHAR_SCAN_PATH # Class variable path
-    def __init__(self, service_path: str):
-        super().__init__(GATT_CHRC_IFACE, WIFI_SCAN_UUID, ["read"], service_path)
+    __slots__ = ('bus', '_cached_ts', '_scan_inflight',
+                 '_notify_value', '_notify_task')
+    def __init__(self, service_path: str, bus=None):
+        super().__init__(GATT_CHRC_IFACE, WIFI_SCAN_UUID, ["read", "notify"], service_path)
+        self.bus = bus # Used for the direct NetworkManager scan path
+        self._cached_bytes = None
+        self._cached_ts = 0.0
+        self._scan_inflight = None # Single-flight latch for concurrent reads
+        self._notify_value = b""
+        self._notify_task = None
+    @dbus_property(access=PropertyAccess.READ)
+    def Value(self) -> 'ay': return self._notify_value
+    async def _notify_scan(self):
+        try:
+            result = await run_wifi_scan(self.bus)
+            ssids = result.get("ssids")
+            if ssids is None:
+                self._notify_value = _dumps(result) # error dict, sent as-is
+                self.emit_properties_changed({'Value': self._notify_value})
+            else:
+                for ssid in ssids:
+                    self._notify_value = ssid.encode("utf-8")
+                    self.emit_properties_changed({'Value': self._notify_value})
+            # Empty Value marks end-of-scan for streaming clients - emitted
+            # on the error path too, so they never wait out their ceiling
+            self._notify_value = b""
+            self.emit_properties_changed({'Value': self._notify_value})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"Notify scan failed: {e}")
+    @method()
+    def StartNotify(self):
+        if self._notify_task is None or self._notify_task.done():
+            log.debug("Client subscribed to scan notifications")
+            self._notify_task = asyncio.ensure_future(self._notify_scan())
+    @method()
+    def StopNotify(self):
+        if self._notify_task is not None and not self._notify_task.done():
+            self._notify_task.cancel()
+        self._notify_task = None
     @method()
     async def ReadValue(self, options: 'a{sv}') -> 'ay':
-        print(">>> WifiScanCharacteristicImpl.ReadValue called")
-        print("Client READ request received (WiFi Scan Char). Starting scan...")
-        loop = asyncio.get_running_loop()
+        if self._cached_bytes is not None and time.monotonic() - self._cached_ts < SCAN_CACHE_TTL:
+            log.debug("Serving cached scan result")
+            return self._cached_bytes
+        # Single-flight: the first reader launches the scan, everyone who
+        # arrives while it runs awaits the same task (two concurrent rescans
+        # would just fight over the radio). Shielded so one client dropping
+        # its read does not cancel the scan under the other waiters.
+        if self._scan_inflight is None:
+            self._scan_inflight = asyncio.ensure_future(self._do_scan())
+            self._scan_inflight.add_done_callback(self._clear_inflight)
+        return await asyncio.shield(self._scan_inflight)
+    def _clear_inflight(self, _task):
+        self._scan_inflight = None
+    async def _do_scan(self) -> bytes:
+        log.debug("Client READ request received (WiFi Scan Char). Starting scan...")
         try:
-            scan_result_dict = await loop.run_in_executor(None, run_wifi_scan)
-            result_json = json.dumps(scan_result_dict)
-            print(f"Sending scan result: {result_json}")
-            # No need to store in self._value if ReadValue returns directly
-            return bytes(result_json, "utf-8")
+            scan_result_dict = await run_wifi_scan(self.bus)
+            # _dumps returns bytes directly, matching the 'ay' reply type
+            result_bytes = (_STATIC_ERROR_PAYLOADS.get(scan_result_dict.get("error"))
+                            or _dumps(scan_result_dict))
+            log.debug("Sending scan result: %s", result_bytes)
+            # Only successes are cached: once a user fixes the failing
+            # condition (rfkill, NM down) the next read should re-probe
+            # instead of serving the stale error for the rest of the TTL
+            if "error" not in scan_result_dict:
+                self._cached_bytes = result_bytes
+                self._cached_ts = time.monotonic()
+            return result_bytes
         except Exception as e:
-            print(f"Error processing scan result in ReadValue: {e}")
-            error_result = json.dumps({"error": f"Failed to process scan: {str(e)}"})
-            return bytes(error_result, "utf-8")
+            log.error(f"Error processing scan result in ReadValue: {e}")
+            return _encode_scan_payload({"error": f"Failed to process scan: {e}"})
+    # Sync handler: always raises, so skip the coroutine allocation dbus-fast
+    # would otherwise make for every rejected call.
     @method()
-    async def WriteValue(self, value: 'ay', options: 'a{sv}'):
+    def WriteValue(self, value: 'ay', options: 'a{sv}'):
          raise DBusError('org.bluez.Error.NotPermitted', 'Write not permitted')
 
 class SetSsidCharacteristicImpl(BleCharacteristic):
     """ Characteristic to receive the target WiFi SSID """
     PATH = CHAR_SSID_PATH # Class variable path
+    __slots__ = ('service',)
     def __init__(self, service: BleService): # Takes service instance
-        super().__init__(GATT_CHRC_IFACE, WIFI_SET_SSID_UUID, ["write"], service.PATH)
+        # write-without-response lets clients pipeline SSID+PSK without an
+        # ATT round trip each; the server-side handling is identical
+        super().__init__(GATT_CHRC_IFACE, WIFI_SET_SSID_UUID, ["write", "write-without-response"], service.PATH)
         self.service = service # Store reference to service
     @method()
     async def WriteValue(self, value: 'ay', options: 'a{sv}'):
-        print(">>> SetSsidCharacteristicImpl.WriteValue called")
+        if len(value) > MAX_SSID_LEN:
+            raise DBusError('org.bluez.Error.InvalidValueLength', 'SSID too long')
         try:
-            ssid = bytes(value).decode("utf-8")
-            print(f"Received target SSID: {ssid}")
+            # dbus-fast hands 'ay' over as bytes/bytearray - decode in place
+            # rather than copying into a fresh bytes first
+            ssid = (value if isinstance(value, (bytes, bytearray)) else bytes(value)).decode("utf-8")
+            log.debug("Received target SSID: %s", ssid)
             self.service._target_ssid = ssid # Store on service
         except UnicodeDecodeError:
-            print("Error: Received invalid UTF-8 data for SSID.")
+            log.error("Received invalid UTF-8 data for SSID.")
             raise DBusError('org.bluez.Error.InvalidValueLength', 'Invalid UTF-8 for SSID')
         except Exception as e:
-            print(f"Error processing SSID write: {e}")
+            log.error(f"Error processing SSID write: {e}")
             raise DBusError('org.bluez.Error.Failed', f'Failed to process SSID: {e}')
     @method()
-    async def ReadValue(self, options: 'a{sv}') -> 'ay':
+    def ReadValue(self, options: 'a{sv}') -> 'ay':
          raise DBusError('org.bluez.Error.NotPermitted', 'Read not permitted')
 
 class SetPskCharacteristicImpl(BleCharacteristic):
     """ Characteristic to receive the target WiFi PSK (Password) """
     PATH = CHAR_PSK_PATH # Class variable path
+    __slots__ = ('service',)
     def __init__(self, service: BleService): # Takes service instance
-        super().__init__(GATT_CHRC_IFACE, WIFI_SET_PSK_UUID, ["write"], service.PATH)
+        super().__init__(GATT_CHRC_IFACE, WIFI_SET_PSK_UUID, ["write", "write-without-response"], service.PATH)
         self.service = service # Store reference to service
     @method()
     async def WriteValue(self, value: 'ay', options: 'a{sv}'):
-        print(">>> SetPskCharacteristicImpl.WriteValue called")
+        if len(value) > MAX_PSK_LEN:
+            raise DBusError('org.bluez.Error.InvalidValueLength', 'PSK too long')
         try:
-            psk = bytes(value).decode("utf-8")
-            print(f"Received target PSK (length={len(psk)})") # Avoid printing actual PSK
+            psk = (value if isinstance(value, (bytes, bytearray)) else bytes(value)).decode("utf-8")
+            log.debug("Received target PSK (length=%d)", len(psk)) # Avoid printing actual PSK
             self.service._target_psk = psk # Store on service
         except UnicodeDecodeError:
-            print("Error: Received invalid UTF-8 data for PSK.")
+            log.error("Received invalid UTF-8 data for PSK.")
             raise DBusError('org.bluez.Error.InvalidValueLength', 'Invalid UTF-8 for PSK')
         except Exception as e:
-            print(f"Error processing PSK write: {e}")
+            log.error(f"Error processing PSK write: {e}")
             raise DBusError('org.bluez.Error.Failed', f'Failed to process PSK: {e}')
     @method()
-    async def ReadValue(self, options: 'a{sv}') -> 'ay':
+    def ReadValue(self, options: 'a{sv}') -> 'ay':
+         raise DBusError('org.bluez.Error.NotPermitted', 'Read not permitted')
+
+class ProvisionCharacteristicImpl(BleCharacteristic):
+    """ Characteristic accepting SSID and PSK together in one JSON write.
+
+    Batching both credentials into a single ATT write saves the client a
+    full connection-interval round trip versus the separate SSID and PSK
+    characteristics (which stay exported for older clients). """
+    PATH = CHAR_PROVISION_PATH # Class variable path
+    __slots__ = ('service',)
+    def __init__(self, service: BleService): # Takes service instance
+        super().__init__(GATT_CHRC_IFACE, WIFI_PROVISION_UUID, ["write"], service.PATH)
+        self.service = service # Store reference to service
+    @method()
+    async def WriteValue(self, value: 'ay', options: 'a{sv}'):
+        if len(value) > MAX_RW_VALUE_LEN:
+            raise DBusError('org.bluez.Error.InvalidValueLength', 'Provision payload too long')
+        try:
+            payload = json.loads(value if isinstance(value, (bytes, bytearray)) else bytes(value))
+            ssid = payload['ssid']
+            psk = payload['psk']
+        except (ValueError, KeyError, TypeError):
+            log.error("Received malformed provision payload.")
+            raise DBusError('org.bluez.Error.Failed', 'Expected JSON object with "ssid" and "psk"')
+        if not isinstance(ssid, str) or len(ssid.encode('utf-8')) > MAX_SSID_LEN:
+            raise DBusError('org.bluez.Error.InvalidValueLength', 'SSID too long')
+        if not isinstance(psk, str) or len(psk.encode('utf-8')) > MAX_PSK_LEN:
+            raise DBusError('org.bluez.Error.InvalidValueLength', 'PSK too long')
+        log.debug("Provisioned SSID %s in one write (psk length=%d)", ssid, len(psk))
+        self.service._target_ssid = ssid # Store on service
+        self.service._target_psk = psk
+    @method()
+    def ReadValue(self, options: 'a{sv}') -> 'ay':
          raise DBusError('org.bluez.Error.NotPermitted', 'Read not permitted')
 
 # --- Application Specific Descriptors ---
@@ -353,16 +685,18 @@ class SetPskCharacteristicImpl(BleCharacteristic):
 class UserDescriptionDescriptorImpl(BleDescriptor):
     """ Read-only User Description Descriptor """
     # PATH is set dynamically in __init__
+    __slots__ = ('PATH',)
     def __init__(self, description: str, characteristic_path: str):
         super().__init__(GATT_DESC_IFACE, USER_DESC_UUID, ["read"], characteristic_path)
-        self._value = bytearray(description, "utf-8")
+        # Immutable after construction, so encode once and serve it as-is
+        self._value = description.encode("utf-8")
         self.PATH = characteristic_path + "/desc0" # Set instance path
     @method()
     async def ReadValue(self, options: 'a{sv}') -> 'ay':
-        print(f">>> UserDescriptionDescriptorImpl.ReadValue called for {self.characteristic_path}")
-        return bytes(self._value) # Return directly
+        log.debug("UserDescriptionDescriptorImpl.ReadValue called for %s", self.characteristic_path)
+        return self._value # Already bytes, no per-read conversion
     @method()
-    async def WriteValue(self, value: 'ay', options: 'a{sv}'):
+    def WriteValue(self, value: 'ay', options: 'a{sv}'):
          raise DBusError('org.bluez.Error.NotPermitted', 'Write not permitted')
 
 # --- Advertising Implementation ---
@@ -370,19 +704,31 @@ class UserDescriptionDescriptorImpl(BleDescriptor):
 class BleAdvertisement(ServiceInterface):
     """ Represents the BLE Advertisement object """
     PATH = ADVERTISEMENT_PATH # Class variable path from user's working version
+    __slots__ = ('type', 'local_name', 'service_uuids', 'appearance', '_props_cache')
     def __init__(self, ad_type: str, local_name: str, service_uuids: 'list[str]', appearance: int):
         super().__init__(LE_ADVERTISEMENT_IFACE)
-        self.type = ad_type; self.local_name = local_name; self.service_uuids = service_uuids; self.appearance = appearance
+        # Frozen copy: nothing mutates the UUID list after construction, and
+        # an immutable value keeps the interned Variant safe to memoize
+        self.type = ad_type; self.local_name = local_name; self.appearance = appearance
+        self.service_uuids = tuple(service_uuids)
+        # Interned Variants, same pattern as the GATT objects: built once so
+        # registration / re-advertise property reads skip re-marshalling
+        self._props_cache = {
+            'Type': Variant('s', ad_type),
+            'LocalName': Variant('s', local_name),
+            'ServiceUUIDs': Variant('as', list(self.service_uuids)),
+            'Appearance': Variant('q', appearance),
+        }
     @dbus_property(access=PropertyAccess.READ)
-    def Type(self) -> 's': return self.type
+    def Type(self) -> 's': return self._props_cache['Type'].value
     @dbus_property(access=PropertyAccess.READ)
-    def LocalName(self) -> 's': return self.local_name
+    def LocalName(self) -> 's': return self._props_cache['LocalName'].value
     @dbus_property(access=PropertyAccess.READ)
-    def ServiceUUIDs(self) -> 'as': return self.service_uuids
+    def ServiceUUIDs(self) -> 'as': return self._props_cache['ServiceUUIDs'].value
     @dbus_property(access=PropertyAccess.READ)
-    def Appearance(self) -> 'q': return self.appearance
+    def Appearance(self) -> 'q': return self._props_cache['Appearance'].value
     @method()
-    def Release(self): print(f"Advertisement ({self.PATH}) released")
+    def Release(self): log.info(f"Advertisement ({self.PATH}) released")
 
 
 # --- Main Execution Logic ---
@@ -395,7 +741,7 @@ async def main():
     # --- Determine device name --- ADDED BACK ---
     device_name = get_dynamic_device_name(WIFI_INTERFACE, DEFAULT_DEVICE_NAME)
 
-    print(f"Starting Direct D-Bus BLE peripheral '{device_name}'...") # Use dynamic name
+    log.info(f"Starting Direct D-Bus BLE peripheral '{device_name}'...") # Use dynamic name
     bus = None
     adapter_path = None
     gatt_manager = None
@@ -404,172 +750,192 @@ async def main():
     advertisement = None
     service = None
     # Characteristics and Descriptors defined within try block
-    exported_paths = [] # Track exported paths
 
     try:
-        print("Connecting to system bus...")
-        bus = await dbus_next.aio.MessageBus(bus_type=BusType.SYSTEM).connect()
-        print("Connected to system bus.")
+        log.info("Connecting to system bus...")
+        bus = await get_bus()
+        log.info("Connected to system bus.")
 
         # --- Find Bluetooth Adapter ---
-        print("Finding Bluetooth adapter...")
-        introspection = await bus.introspect(BLUEZ_SERVICE, '/')
-        obj_manager = bus.get_proxy_object(BLUEZ_SERVICE, '/', introspection)
-        interface = obj_manager.get_interface(DBUS_OM_IFACE)
-        managed_objects = await interface.call_get_managed_objects()
-        for path, interfaces in managed_objects.items():
-            if GATT_MANAGER_IFACE in interfaces:
-                adapter_path = path
-                print(f"Found GATT Manager at: {adapter_path}")
-                break
+        # Fast path: nearly every host has a single adapter at the well-known
+        # path, so try that first and only fall back to the (potentially
+        # large) GetManagedObjects scan when it isn't there.
+        log.info("Finding Bluetooth adapter...")
+        has_ad_manager = False
+        try:
+            probe = await bus.introspect(BLUEZ_SERVICE, DEFAULT_ADAPTER_PATH)
+            if any(iface.name == GATT_MANAGER_IFACE for iface in probe.interfaces):
+                adapter_path = DEFAULT_ADAPTER_PATH
+                has_ad_manager = any(iface.name == LE_ADVERTISING_MANAGER_IFACE for iface in probe.interfaces)
+                log.info(f"Found GATT Manager at: {adapter_path}")
+        except DBusError:
+            pass
+        if not adapter_path:
+            introspection = await bus.introspect(BLUEZ_SERVICE, '/')
+            obj_manager = bus.get_proxy_object(BLUEZ_SERVICE, '/', introspection)
+            interface = obj_manager.get_interface(DBUS_OM_IFACE)
+            managed_objects = await interface.call_get_managed_objects()
+            for path, interfaces in managed_objects.items():
+                if GATT_MANAGER_IFACE in interfaces:
+                    adapter_path = path
+                    has_ad_manager = LE_ADVERTISING_MANAGER_IFACE in interfaces
+                    log.info(f"Found GATT Manager at: {adapter_path}")
+                    break
         if not adapter_path: raise Exception("Bluetooth adapter with GATT Manager not found.")
 
         # --- Get GATT Manager and Advertising Manager ---
-        gatt_introspection = await bus.introspect(BLUEZ_SERVICE, adapter_path)
-        adapter_object = bus.get_proxy_object(BLUEZ_SERVICE, adapter_path, gatt_introspection)
+        # Both discovery paths already told us which interfaces the adapter
+        # carries, so build the proxy from the static node instead of
+        # introspecting the adapter (again).
+        adapter_object = bus.get_proxy_object(BLUEZ_SERVICE, adapter_path, _ADAPTER_NODE_XML)
         gatt_manager = adapter_object.get_interface(GATT_MANAGER_IFACE)
-        # Check for Ad Manager support (might fail if adapter doesn't support it)
-        try:
+        if has_ad_manager:
             ad_manager = adapter_object.get_interface(LE_ADVERTISING_MANAGER_IFACE)
-            print("Got GATT Manager and Advertising Manager interfaces.")
-        except Exception:
-             ad_manager = None
-             print("Got GATT Manager interface. Advertising Manager not available or failed to get.")
+            log.info("Got GATT Manager and Advertising Manager interfaces.")
+        else:
+            ad_manager = None
+            log.info("Got GATT Manager interface. Advertising Manager not available.")
 
         # --- Create Application Objects ---
-        print("Creating GATT objects...")
+        log.info("Creating GATT objects...")
         app = Application(bus, APP_PATH)
         service = BleService(SERVICE_UUID, True)
         # Create characteristics
         char_rw = ReadWriteCharacteristicImpl(service.PATH)
-        char_scan = WifiScanCharacteristicImpl(service.PATH)
+        char_scan = WifiScanCharacteristicImpl(service.PATH, bus)
         char_ssid = SetSsidCharacteristicImpl(service)
         char_psk = SetPskCharacteristicImpl(service)
+        char_provision = ProvisionCharacteristicImpl(service)
         # Create descriptors
         desc_rw = UserDescriptionDescriptorImpl("Read/Write Value", char_rw.PATH)
         desc_scan = UserDescriptionDescriptorImpl("WiFi Scan Trigger/Result", char_scan.PATH)
         desc_ssid = UserDescriptionDescriptorImpl("Set Target SSID", char_ssid.PATH)
         desc_psk = UserDescriptionDescriptorImpl("Set Target PSK", char_psk.PATH)
+        desc_provision = UserDescriptionDescriptorImpl("Provision SSID+PSK (JSON)", char_provision.PATH)
 
         # --- Link objects together ---
         service.add_characteristic_path(char_rw.PATH)
         service.add_characteristic_path(char_scan.PATH)
         service.add_characteristic_path(char_ssid.PATH)
         service.add_characteristic_path(char_psk.PATH)
+        service.add_characteristic_path(char_provision.PATH)
         char_rw.add_descriptor_path(desc_rw.PATH)
         char_scan.add_descriptor_path(desc_scan.PATH)
         char_ssid.add_descriptor_path(desc_ssid.PATH)
         char_psk.add_descriptor_path(desc_psk.PATH)
-
-        # --- Add object instances to Application for GetManagedObjects ---
-        print("Adding objects to Object Manager...")
-        app.add_object(service.PATH, service)
-        app.add_object(char_rw.PATH, char_rw)
-        app.add_object(char_scan.PATH, char_scan)
-        app.add_object(char_ssid.PATH, char_ssid)
-        app.add_object(char_psk.PATH, char_psk)
-        app.add_object(desc_rw.PATH, desc_rw)
-        app.add_object(desc_scan.PATH, desc_scan)
-        app.add_object(desc_ssid.PATH, desc_ssid)
-        app.add_object(desc_psk.PATH, desc_psk)
-
-        # --- Export objects onto D-Bus ---
-        print("Exporting objects...")
-        bus.export(APP_PATH, app); exported_paths.append(APP_PATH)
-        bus.export(service.PATH, service); exported_paths.append(service.PATH)
-        bus.export(char_rw.PATH, char_rw); exported_paths.append(char_rw.PATH)
-        bus.export(char_scan.PATH, char_scan); exported_paths.append(char_scan.PATH)
-        bus.export(char_ssid.PATH, char_ssid); exported_paths.append(char_ssid.PATH)
-        bus.export(char_psk.PATH, char_psk); exported_paths.append(char_psk.PATH)
-        bus.export(desc_rw.PATH, desc_rw); exported_paths.append(desc_rw.PATH)
-        bus.export(desc_scan.PATH, desc_scan); exported_paths.append(desc_scan.PATH)
-        bus.export(desc_ssid.PATH, desc_ssid); exported_paths.append(desc_ssid.PATH)
-        bus.export(desc_psk.PATH, desc_psk); exported_paths.append(desc_psk.PATH)
-        print("GATT objects exported.")
+        char_provision.add_descriptor_path(desc_provision.PATH)
+
+        # --- Add object instances to Application and export onto D-Bus ---
+        gatt_objects = (service, char_rw, char_scan, char_ssid, char_psk,
+                        char_provision, desc_rw, desc_scan, desc_ssid,
+                        desc_psk, desc_provision)
+        log.info("Registering objects and exporting...")
+        app.add_objects(gatt_objects)
+        # Nothing is exported at APP_PATH itself: dbus-fast serves
+        # GetManagedObjects there from the exported children below it.
+        export = bus.export # One descriptor lookup for the whole batch
+        for obj in gatt_objects:
+            export(obj.PATH, obj)
+        log.info("GATT objects exported.")
 
         # --- Register GATT Application ---
-        print("Registering GATT application...")
-        await gatt_manager.call_register_application(APP_PATH, {})
-        print("GATT application registered successfully.")
-
-        # --- Create and Register Advertisement ---
-        if ad_manager: # Only proceed if Ad Manager was found
-            print("Creating and registering advertisement...")
+        # --- Register GATT application and advertisement concurrently ---
+        # Independent BlueZ round-trips, so issue both at once; the device
+        # becomes advertisable one RTT sooner.
+        if ad_manager: # Only register the advertisement if Ad Manager was found
+            log.info("Registering GATT application and advertisement...")
             # --- Use dynamic device_name here --- MODIFIED ---
             advertisement = BleAdvertisement("peripheral", device_name, [SERVICE_UUID], 0x0340)
-            bus.export(advertisement.PATH, advertisement); exported_paths.append(advertisement.PATH)
-            await ad_manager.call_register_advertisement(advertisement.PATH, {})
-            print("Advertisement registered successfully.")
+            bus.export(advertisement.PATH, advertisement)
+            await asyncio.gather(
+                gatt_manager.call_register_application(APP_PATH, {}),
+                ad_manager.call_register_advertisement(advertisement.PATH, {}))
+            log.info("GATT application and advertisement registered successfully.")
         else:
-            print("Skipping advertisement registration (LEAdvertisingManager not available).")
+            log.info("Registering GATT application (LEAdvertisingManager not available)...")
+            await gatt_manager.call_register_application(APP_PATH, {})
+            log.info("GATT application registered successfully.")
 
-        print("Peripheral setup complete. Running event loop (Press Ctrl+C to stop)...")
+        log.info("Peripheral setup complete. Running event loop (Press Ctrl+C to stop)...")
         stop_event = asyncio.Event()
-        await stop_event.wait()
-
-    except asyncio.CancelledError: print("Main task cancelled.")
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+        try:
+            await stop_event.wait()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
+
+    except asyncio.CancelledError: log.info("Main task cancelled.")
     except DBusError as e:
-        print(f"D-Bus Error occurred: {e.type} - {e.text}")
+        log.error(f"D-Bus Error occurred: {e.type} - {e.text}")
         traceback.print_exc()
     except Exception as e:
-        print(f"An error occurred during setup or runtime: {e}")
-        print("Traceback:")
+        log.error(f"An error occurred during setup or runtime: {e}")
+        log.error("Traceback:")
         traceback.print_exc()
 
     finally:
         # Using shutdown logic from user's working version (080b505)
-        print("Shutting down...")
+        log.info("Shutting down...")
         if bus and bus.connected:
-            # Unregister Ad
-            if ad_manager and advertisement:
+            async def _unregister(what, coro):
                 try:
-                    print("Unregistering advertisement...")
-                    await ad_manager.call_unregister_advertisement(advertisement.PATH)
+                    log.info(f"Unregistering {what}...")
+                    await coro
                 except DBusError as e:
-                    if e.type != 'org.freedesktop.DBus.Error.UnknownObject' and e.type != 'org.bluez.Error.DoesNotExist': print(f"D-Bus Error unregistering advertisement: {e.type} - {e.text}")
-                except Exception as e: print(f"Error unregistering advertisement: {e}")
-            # Unregister App
+                    if e.type != 'org.freedesktop.DBus.Error.UnknownObject' and e.type != 'org.bluez.Error.DoesNotExist': log.error(f"D-Bus Error unregistering {what}: {e.type} - {e.text}")
+                except Exception as e: log.error(f"Error unregistering {what}: {e}")
+            # Unregister Ad and App concurrently - independent calls, and each
+            # swallows its own errors so one failing cannot mask the other
+            teardown = []
+            if ad_manager and advertisement:
+                teardown.append(_unregister("advertisement",
+                    ad_manager.call_unregister_advertisement(advertisement.PATH)))
             if gatt_manager and app:
-                try:
-                    print("Unregistering GATT application...")
-                    await gatt_manager.call_unregister_application(APP_PATH)
-                except DBusError as e:
-                    if e.type != 'org.freedesktop.DBus.Error.UnknownObject' and e.type != 'org.bluez.Error.DoesNotExist': print(f"D-Bus Error unregistering application: {e.type} - {e.text}")
-                except Exception as e: print(f"Error unregistering application: {e}")
-            # Unexport paths
-            print(f"Unexporting {len(exported_paths)} D-Bus objects...")
-            for path in reversed(exported_paths):
-                try: bus.unexport(path)
-                except Exception as e: print(f"Error unexporting path {path}: {e}")
-            print("D-Bus objects unexported.")
+                teardown.append(_unregister("GATT application",
+                    gatt_manager.call_unregister_application(APP_PATH)))
+            if teardown:
+                await asyncio.gather(*teardown)
+            # Unexport paths - the registry already knows every GATT
+            # object, so no separate exported-paths list is needed.
+            if app:
+                log.info(f"Unexporting {len(app.service_objects)} D-Bus objects...")
+                if advertisement:
+                    try: bus.unexport(advertisement.PATH)
+                    except Exception as e: log.error(f"Error unexporting path {advertisement.PATH}: {e}")
+                for path in reversed(list(app.service_objects.keys())):
+                    try: bus.unexport(path)
+                    except Exception as e: log.error(f"Error unexporting path {path}: {e}")
+                log.info("D-Bus objects unexported.")
             # Disconnect bus
-            print("Disconnecting from system bus...")
+            log.info("Disconnecting from system bus...")
             bus.disconnect()
-            print("Disconnected from system bus.")
-        else: print("Bus connection was not established or already closed.")
-        print("Shutdown complete.")
+            log.info("Disconnected from system bus.")
+        else: log.info("Bus connection was not established or already closed.")
+        log.info("Shutdown complete.")
 
 
 # Run the main asynchronous function
-# Using main loop execution from user's working version (080b505)
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass # Stock asyncio loop works fine, uvloop is just faster
+    # Level is env-tunable so a deployed unit can run quiet (WARNING) or
+    # chatty (DEBUG) without editing the service file.
+    log_level = os.environ.get("BTPIFI_LOG_LEVEL", "INFO").upper()
+    logging.basicConfig(level=getattr(logging, log_level, logging.INFO),
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     # Check for root privileges (optional but recommended)
-    import os # Added back import needed for check
     if os.geteuid() != 0:
-        print("Warning: This script typically needs root privileges (sudo) to access the D-Bus system bus and run 'nmcli'.")
+        log.warning("This script typically needs root privileges (sudo) to access the D-Bus system bus and run 'nmcli'.")
 
-    loop = asyncio.get_event_loop()
-    main_task = None
     try:
-        main_task = asyncio.ensure_future(main())
-        loop.run_forever()
+        asyncio.run(main())
     except KeyboardInterrupt:
-        print("\nKeyboardInterrupt received, stopping.")
-    finally:
-        if main_task:
-            main_task.cancel()
-            try: loop.run_until_complete(main_task)
-            except asyncio.CancelledError: pass
-        if loop.is_running(): loop.stop()
-        if not loop.is_closed(): loop.run_until_complete(loop.shutdown_asyncgens()); loop.close()
-        print("Event loop closed.")
+        log.info("KeyboardInterrupt received, stopping.")
@@ -2,7 +2,9 @@
 # -*- coding:utf-8 -*-
 import sys
 import os
+import fcntl
 import logging
+import struct
 import time
 import socket
 
@@ -13,14 +15,39 @@ libdir = os.path.join(os.path.dirname(os.path.realpath('/home/eric/lib')), 'lib'
 if os.path.exists(libdir):
      sys.path.append(libdir)
 
+SIOCGIFADDR = 0x8915 # from linux/sockios.h
+
+def _default_iface():
+    # First /proc/net/route entry with destination 0.0.0.0
+    with open('/proc/net/route') as f:
+        for line in f.readlines()[1:]:
+            fields = line.split()
+            if fields[1] == '00000000':
+                return fields[0]
+    return None
+
+_cached_ip = None
+
 def get_ip():
+    # Ask the kernel directly (SIOCGIFADDR on the default-route iface)
+    # instead of the UDP-connect trick, which can block in route lookup
+    # on a Pi that is still bringing its network up. Cached - this script
+    # renders once per boot.
+    global _cached_ip
+    if _cached_ip is not None:
+        return _cached_ip
     try:
+        iface = _default_iface()
+        if iface is None:
+            return "No IP"
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        # doesn't need to be reachable
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-        return ip
+        try:
+            packed = fcntl.ioctl(s.fileno(), SIOCGIFADDR,
+                                 struct.pack('256s', iface[:15].encode()))
+        finally:
+            s.close()
+        _cached_ip = socket.inet_ntoa(packed[20:24])
+        return _cached_ip
     except Exception:
         return "No IP"
 
@@ -30,6 +57,31 @@ ip_address = get_ip()
 from waveshare_epd import epd2in13_V4
 from PIL import Image, ImageDraw, ImageFont
 
+_fonts = None
+
+def load_fonts():
+    """Parse the TTFs once per process and reuse the Font objects.
+
+    The basic layout engine skips Raqm/HarfBuzz shaping, which monospaced
+    ASCII labels never need - a measurable save on a Pi Zero. (FreeType
+    font objects wrap C state and do not pickle, so an on-disk cache is
+    not an option; per-process memoization is the best Pillow offers.)"""
+    global _fonts
+    if _fonts is None:
+        # You might need to install fonts: sudo apt install fonts-freefont-ttf
+        try:
+            _fonts = (
+                ImageFont.truetype('/usr/share/fonts/truetype/freefont/FreeMono.ttf', 15,
+                                   layout_engine=ImageFont.Layout.BASIC),
+                ImageFont.truetype('/usr/share/fonts/truetype/freefont/FreeMonoBold.ttf', 24,
+                                   layout_engine=ImageFont.Layout.BASIC),
+            )
+        except IOError:
+            logging.warning("Default font not found, using load_default()")
+            default = ImageFont.load_default()
+            _fonts = (default, default)
+    return _fonts
+
 logging.basicConfig(level=logging.DEBUG)
 
 try:
@@ -52,34 +104,31 @@ try:
     # Dimensions for 2.13 V4 are 122x250 (Width x Height)
     # Note: Pillow uses (width, height), but drawing might feel rotated
     # depending on how you hold the Pi/display. Let's assume standard orientation.
-    image = Image.new('1', (epd.height, epd.width), 255) # 255: white background
+    # The label and separator never change; only the IP line does. Render the
+    # static parts once as the partial-refresh base image.
+    base_image = Image.new('1', (epd.height, epd.width), 255) # 255: white background
+    base_draw = ImageDraw.Draw(base_image)
 
-    # Get a drawing object
-    draw = ImageDraw.Draw(image)
+    font15, font24 = load_fonts()
 
-    # Load a font
-    # You might need to install fonts: sudo apt install fonts-freefont-ttf
-    # Or provide a path to a specific .ttf file
-    try:
-        font15 = ImageFont.truetype('/usr/share/fonts/truetype/freefont/FreeMono.ttf', 15)
-        font24 = ImageFont.truetype('/usr/share/fonts/truetype/freefont/FreeMonoBold.ttf', 24)
-    except IOError:
-        logging.warning("Default font not found, using load_default()")
-        font15 = ImageFont.load_default()
-        font24 = ImageFont.load_default()
-
-    # Draw some text
+    # Static text and separator go on the base image
     # Coordinates are (x, y) from the top-left corner
-    draw.text((10, 0), f'{ip_address}', font=font24, fill=0)
-    draw.text((10, 80), 'Waiting for BLE...', font=font15, fill=0)
+    base_draw.text((10, 80), 'Waiting for BLE...', font=font15, fill=0)
+    base_draw.line([(0, 110), (epd.height, 110)], fill=0, width=2)
+
+    logging.info("Displaying base image...")
+    # One full refresh establishes the partial-update base
+    epd.displayPartBaseImage(epd.getbuffer(base_image))
 
-    # Draw a line
-    draw.line([(0, 110), (epd.height, 110)], fill=0, width=2)
+    # Only the IP changes; draw it on a copy and push it with the partial
+    # waveform (~10x faster than a full refresh on the 2.13 V4, and far
+    # fewer SPI bytes if this loops later)
+    image = base_image.copy()
+    draw = ImageDraw.Draw(image)
+    draw.text((10, 0), f'{ip_address}', font=font24, fill=0)
 
-    logging.info("Displaying image...")
-    # Display the image buffer on the e-ink screen
-    # The library handles rotation if needed, but the image buffer should match dimensions
-    epd.display(epd.getbuffer(image))
+    logging.info("Displaying IP (partial refresh)...")
+    epd.displayPartial(epd.getbuffer(image))
     time.sleep(2) # Give display time to update
 
     # --- Put the display to sleep ---
@@ -0,0 +1,35 @@
+"""Single entry point for the BLE test clients.
+
+Running the simple and notify flows from one process pays the interpreter
+startup (and the optional uvloop install) once instead of per script:
+
+    python testclient --mode simple   # one-shot provisioning flow (b_c.py)
+    python testclient --mode notify   # notification listener (ble_client.py)
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# The clients live here as plain scripts, not a package
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import b_c
+import ble_client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BtPiFi BLE test client")
+    parser.add_argument("--mode", choices=("simple", "notify"), default="simple",
+                        help="simple: read/scan/provision once; "
+                             "notify: subscribe and stream notifications")
+    args = parser.parse_args()
+    runner = b_c.main if args.mode == "simple" else ble_client.main
+    try:
+        asyncio.run(runner())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,46 @@
 import asyncio
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass # Stock asyncio loop works fine, uvloop is just faster
+import uuid
 from bleak import BleakClient, BleakScanner
 
-# UUIDs from your GATT server
+# UUIDs from your GATT server. The characteristic UUIDs are parsed once
+# here; bleak accepts uuid.UUID and skips its per-call normalization.
+# SERVICE_UUID stays a string - it is compared against advertisement data.
 SERVICE_UUID = "133934e0-01f5-4054-a88f-0136e064c49e"
-CHAR_READ_WRITE_UUID = "133934e1-01f5-4054-a88f-0136e064c49e"
-WIFI_SCAN_UUID = "133934e2-01f5-4054-a88f-0136e064c49e"
-WIFI_SET_SSID_UUID = "133934e3-01f5-4054-a88f-0136e064c49e"
-WIFI_SET_PSK_UUID = "133934e4-01f5-4054-a88f-0136e064c49e"
-WIFI_CONNECT_UUID = "133934e5-01f5-4054-a88f-0136e064c49e"
+CHAR_READ_WRITE_UUID = uuid.UUID("133934e1-01f5-4054-a88f-0136e064c49e")
+WIFI_SCAN_UUID = uuid.UUID("133934e2-01f5-4054-a88f-0136e064c49e")
+WIFI_SET_SSID_UUID = uuid.UUID("133934e3-01f5-4054-a88f-0136e064c49e")
+WIFI_SET_PSK_UUID = uuid.UUID("133934e4-01f5-4054-a88f-0136e064c49e")
+WIFI_CONNECT_UUID = uuid.UUID("133934e5-01f5-4054-a88f-0136e064c49e")
+
+async def find_target_device(timeout=10.0):
+    """Resolve the BtPiFi device, returning on the first match.
+
+    The detection callback sets the event as soon as a matching
+    advertisement arrives, so this returns immediately instead of always
+    waiting out a full discover() window."""
+    found = asyncio.Event()
+    target = None
+    def on_detect(device, ad):
+        nonlocal target
+        if device.name is not None and "BtPiFi" in device.name:
+            target = device
+            found.set()
+    async with BleakScanner(detection_callback=on_detect):
+        try:
+            await asyncio.wait_for(found.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    return target
 
 async def scan_and_connect():
     # Perform a scan to find your device
     print("Scanning for devices...")
-    devices = await BleakScanner.discover()
-
-    # Find and print the target device
-    target_device = None
-    for device in devices:
-        # Print device info regardless of name
-        print(f"Found: {device.name}, {device.address}")
-        # Check if device.name is not None before checking its content
-        if device.name is not None and "BtPiFi" in device.name:
-            print(f"   ^ Found target device!")
-            target_device = device
-            break # Found it, stop scanning
+    target_device = await find_target_device()
 
     if not target_device:
         print("Target BLE device not found!")
@@ -42,19 +59,20 @@ async def scan_and_connect():
         scan_result = await client.read_gatt_char(WIFI_SCAN_UUID)
         print(f"WiFi Scan Result: {scan_result.decode('utf-8', errors='ignore')}")
 
-        # Writing target SSID
+        # Write SSID and PSK concurrently, without response -
+        # independent writes, so skip the per-write ATT roundtrip
         test_ssid = "Ericnet"
-        await client.write_gatt_char(WIFI_SET_SSID_UUID, bytearray(test_ssid, 'utf-8'))
-        print(f"Wrote SSID: {test_ssid}")
-
-        # Writing target PSK
         test_psk = "goodluck"
-        await client.write_gatt_char(WIFI_SET_PSK_UUID, bytearray(test_psk, 'utf-8'))
+        await asyncio.gather(
+            client.write_gatt_char(WIFI_SET_SSID_UUID, test_ssid.encode('utf-8'), response=False),
+            client.write_gatt_char(WIFI_SET_PSK_UUID, test_psk.encode('utf-8'), response=False))
+        print(f"Wrote SSID: {test_ssid}")
         print(f"Wrote PSK: {test_psk}")
 
-        # Trigger connection
+        # Trigger connection (with response, so we know it landed
+        # after the credential writes)
         print("Triggering connection...")
-        await client.write_gatt_char(WIFI_CONNECT_UUID, bytearray(b'trigger'))
+        await client.write_gatt_char(WIFI_CONNECT_UUID, b'trigger')
 
 async def main():
     await scan_and_connect()
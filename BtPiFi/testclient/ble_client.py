@@ -1,15 +1,23 @@
 import asyncio
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass # Stock asyncio loop works fine, uvloop is just faster
 import logging
 import sys
+import uuid
 from bleak import BleakClient, BleakScanner
 from bleak.exc import BleakError
 
 # --- Configuration (Should match the server script) ---
-# Use the UUIDs defined in your ble_service_revised script
+# Use the UUIDs defined in your ble_service_revised script. Characteristic
+# UUIDs are parsed once; bleak accepts uuid.UUID and skips per-call
+# normalization. The service UUID stays a string for the scanner filter.
 TARGET_SERVICE_UUID = "133934e0-01f5-4054-a88f-0136e064c49e"
-CMD_CHAR_UUID = "133934e1-01f5-4054-a88f-0136e064c49e" # Write
-STATUS_CHAR_UUID = "133934e2-01f5-4054-a88f-0136e064c49e" # Read, Notify
-SSID_CHAR_UUID = "133934e3-01f5-4054-a88f-0136e064c49e" # Read, Notify
+CMD_CHAR_UUID = uuid.UUID("133934e1-01f5-4054-a88f-0136e064c49e") # Write
+STATUS_CHAR_UUID = uuid.UUID("133934e2-01f5-4054-a88f-0136e064c49e") # Read, Notify
+SSID_CHAR_UUID = uuid.UUID("133934e3-01f5-4054-a88f-0136e064c49e") # Read, Notify
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -32,20 +40,22 @@ async def run_ble_client():
     target_device = None
     logger.info("Scanning for devices advertising our service...")
 
-    # Scan for devices advertising the specific service UUID
-    devices = await BleakScanner.discover(service_uuids=[TARGET_SERVICE_UUID], timeout=10.0)
+    # Return as soon as the first matching advertisement is seen instead of
+    # always waiting out the full discover() window
+    target_device = await BleakScanner.find_device_by_filter(
+        lambda d, ad: TARGET_SERVICE_UUID in (ad.service_uuids or []),
+        timeout=10.0)
 
-    if not devices:
+    if target_device is None:
         logger.error(f"Could not find device advertising service {TARGET_SERVICE_UUID}")
         return
-
-    # Assuming the first found device is the target
-    # In a real scenario, you might filter by name or address if multiple devices advertise the same UUID
-    target_device = devices[0]
     logger.info(f"Found target device: {target_device.name} ({target_device.address})")
 
-    # Create a client instance and connect
-    async with BleakClient(target_device.address) as client:
+    # Create a client instance and connect; the callback turns disconnects
+    # into an event we can await instead of polling is_connected
+    disconnected_event = asyncio.Event()
+    async with BleakClient(target_device.address,
+                           disconnected_callback=lambda c: disconnected_event.set()) as client:
         if not client.is_connected:
             logger.error(f"Failed to connect to {target_device.address}")
             return
@@ -53,21 +63,19 @@ async def run_ble_client():
         logger.info(f"Connected to {client.address}")
 
         try:
-            # --- Read Initial Values ---
-            logger.info("Reading initial Status...")
-            status_value_bytes = await client.read_gatt_char(STATUS_CHAR_UUID)
+            # --- Read Initial Values (independent, so pipeline them) ---
+            logger.info("Reading initial Status and SSIDs...")
+            status_value_bytes, ssid_value_bytes = await asyncio.gather(
+                client.read_gatt_char(STATUS_CHAR_UUID),
+                client.read_gatt_char(SSID_CHAR_UUID))
             logger.info(f"Initial Status: '{status_value_bytes.decode('utf-8', errors='replace')}'")
-
-            logger.info("Reading initial SSIDs...")
-            ssid_value_bytes = await client.read_gatt_char(SSID_CHAR_UUID)
             logger.info(f"Initial SSIDs: '{ssid_value_bytes.decode('utf-8', errors='replace')}'")
 
-            # --- Enable Notifications ---
-            logger.info("Enabling Status notifications...")
-            await client.start_notify(STATUS_CHAR_UUID, handle_status_notification)
-
-            logger.info("Enabling SSID notifications...")
-            await client.start_notify(SSID_CHAR_UUID, handle_ssid_notification)
+            # --- Enable Notifications (also independent) ---
+            logger.info("Enabling Status and SSID notifications...")
+            await asyncio.gather(
+                client.start_notify(STATUS_CHAR_UUID, handle_status_notification),
+                client.start_notify(SSID_CHAR_UUID, handle_ssid_notification))
 
             logger.info("Notifications enabled. Ready to send command.")
             await asyncio.sleep(1.0) # Short pause
@@ -80,9 +88,8 @@ async def run_ble_client():
 
             # --- Keep Running to Receive Notifications ---
             logger.info("Client running. Waiting for notifications... Press Ctrl+C to exit.")
-            # Keep the script alive to receive notifications
-            while client.is_connected:
-                await asyncio.sleep(1.0) # Check connection status periodically
+            # Sleep until the peer disconnects - no 1s polling wakeups
+            await disconnected_event.wait()
 
         except BleakError as e:
             logger.error(f"BleakError during operation: {e}", exc_info=True)
@@ -1,6 +1,15 @@
 import asyncio
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass # Stock asyncio loop works fine, uvloop is just faster
+import json
 import logging
+import random
+import re
 from bleak import BleakClient, BleakScanner
+from bleak.backends.device import BLEDevice
 from bleak.exc import BleakError
 
 # Configure logging
@@ -13,20 +22,34 @@ CHAR_READ_WRITE_UUID = "133934e1-01f5-4054-a88f-0136e064c49e"
 WIFI_SCAN_UUID = "133934e2-01f5-4054-a88f-0136e064c49e"
 WIFI_SET_SSID_UUID = "133934e3-01f5-4054-a88f-0136e064c49e"
 WIFI_SET_PSK_UUID = "133934e4-01f5-4054-a88f-0136e064c49e"
+WIFI_PROVISION_UUID = "133934e6-01f5-4054-a88f-0136e064c49e"
 
 # Configuration
-MAX_SCAN_ATTEMPTS = 30
+MAX_SCAN_ATTEMPTS = 3  # each attempt now returns as soon as the device is seen
 SCAN_TIMEOUT = 10.0  # seconds
 CONNECTION_TIMEOUT = 30.0  # seconds
 RETRY_DELAY = 1.0  # seconds between retries
 CHAR_OPERATION_RETRIES = 3  # number of retries for characteristic operations
-CHAR_OPERATION_DELAY = 2.0  # increased delay between characteristic operation retries
 CONNECTION_STABILIZATION_DELAY = 2.0  # seconds to wait after connection
+# Requested connection interval bounds, in 1.25 ms units (11.25-30 ms).
+# A shorter interval bounds the latency of every small GATT op below.
+CONN_MIN_INTERVAL = 9
+CONN_MAX_INTERVAL = 24
 WIFI_SCAN_WAIT = 12.0  # seconds to wait for WiFi scan to complete
 
+# Compiled once: one case-insensitive C-level scan per device instead of
+# two str.lower() copies plus two substring searches in the callback
+_TARGET_RE = re.compile(r"btpifi|raspberrypi", re.IGNORECASE)
+
 def get_device_info(device):
     """Safely extract device information, handling different formats"""
     try:
+        # Fast path: bleak always yields BLEDevice, so one isinstance check
+        # replaces the chain of hasattr probes (each of which is an attribute
+        # lookup plus exception machinery) on the per-device scan path
+        if isinstance(device, BLEDevice):
+            return device.name or "Unknown", device.address, getattr(device, "rssi", None)
+
         # Handle the case where device might be a string or other format
         if not hasattr(device, '__dict__'):
             return None, None, None
@@ -57,59 +80,93 @@ def get_device_info(device):
         return None, None, None
 
 def log_device_info(device):
-    """Log detailed information about a discovered device"""
+    """Log detailed information about a discovered device (DEBUG only)"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return  # skip all formatting work when the dump would be dropped
     try:
         name, address, rssi = get_device_info(device)
         if name is None and address is None:
             return  # Skip devices we can't get info from
 
         # Log all device info for debugging
-        logger.info(f"Device: {name or 'Unknown'}")
+        logger.debug("Device: %s", name or 'Unknown')
         if address:
-            logger.info(f"  Address: {address}")
+            logger.debug("  Address: %s", address)
         if rssi is not None:
-            logger.info(f"  RSSI: {rssi}")
+            logger.debug("  RSSI: %s", rssi)
         if hasattr(device, 'metadata') and device.metadata:
-            logger.info(f"  Metadata: {device.metadata}")
+            logger.debug("  Metadata: %s", device.metadata)
         if hasattr(device, 'advertisement_data') and device.advertisement_data:
             adv_data = device.advertisement_data
-            logger.info(f"  Advertisement Data:")
+            logger.debug("  Advertisement Data:")
             if hasattr(adv_data, 'manufacturer_data'):
-                logger.info(f"    Manufacturer Data: {adv_data.manufacturer_data}")
+                logger.debug("    Manufacturer Data: %s", adv_data.manufacturer_data)
             if hasattr(adv_data, 'service_data'):
-                logger.info(f"    Service Data: {adv_data.service_data}")
+                logger.debug("    Service Data: %s", adv_data.service_data)
             if hasattr(adv_data, 'service_uuids'):
-                logger.info(f"    Service UUIDs: {adv_data.service_uuids}")
+                logger.debug("    Service UUIDs: %s", adv_data.service_uuids)
             if hasattr(adv_data, 'local_name'):
-                logger.info(f"    Local Name: {adv_data.local_name}")
+                logger.debug("    Local Name: %s", adv_data.local_name)
     except Exception as e:
         logger.debug(f"Error logging device info: {e}")
 
+async def backoff(attempt, base=0.1, cap=2.0):
+    """Exponential backoff with a little jitter to avoid lockstep retries."""
+    await asyncio.sleep(min(cap, base * 2 ** attempt) + random.random() * 0.05)
+
+def request_low_latency_conn_params(adapter="hci0"):
+    """Best-effort request for a shorter BLE connection interval.
+
+    BlueZ picks ~50-100 ms by default and central-side renegotiation after
+    connect is commonly rejected, so set the kernel's debugfs bounds before
+    connecting. Needs root and mounted debugfs; quietly keeps the defaults
+    otherwise."""
+    base = f"/sys/kernel/debug/bluetooth/{adapter}"
+    try:
+        with open(f"{base}/conn_min_interval", "w") as f:
+            f.write(str(CONN_MIN_INTERVAL))
+        with open(f"{base}/conn_max_interval", "w") as f:
+            f.write(str(CONN_MAX_INTERVAL))
+        logger.info(f"Requested connection interval {CONN_MIN_INTERVAL * 1.25:.2f}-{CONN_MAX_INTERVAL * 1.25:.2f} ms")
+    except OSError as e:
+        logger.debug(f"Could not set connection interval (needs root + debugfs): {e}")
+
 async def scan_for_device():
     """Scan for the BtPiFi device with retries"""
     for attempt in range(MAX_SCAN_ATTEMPTS):
         logger.info(f"Scanning for BtPiFi device (attempt {attempt + 1}/{MAX_SCAN_ATTEMPTS})...")
-        
+
         try:
-            # Simple scan with no filters
-            devices = await BleakScanner.discover(timeout=SCAN_TIMEOUT)
-            logger.info(f"Found {len(devices)} devices in scan")
-            
-            # Log all discovered devices
-            for device in devices:
-                name = device.name or "Unknown"
-                address = device.address
-                logger.info(f"Found device: {name} ({address})")
-                
+            found = asyncio.get_running_loop().create_future()
+            seen = set()
+
+            def on_detect(device, adv):
+                name = device.name or adv.local_name or "Unknown"
+                seen.add(device.address)
+                # Per-device chatter only at DEBUG; %-style args so nothing
+                # is formatted when the level is disabled
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Found device: %s (%s)", name, device.address)
                 # Check if this is our target device
-                if name and ("btpifi" in name.lower() or "raspberrypi" in name.lower()):
-                    logger.info(f"Found target device: {name} ({address})")
+                if not found.done() and _TARGET_RE.search(name):
+                    found.set_result(device)
+
+            # Advertise-filtered scan: the OS only wakes us for packets
+            # carrying our service UUID, and the future resolves on the first
+            # match instead of waiting out the whole window
+            async with BleakScanner(detection_callback=on_detect,
+                                    service_uuids=[SERVICE_UUID]):
+                try:
+                    device = await asyncio.wait_for(found, timeout=SCAN_TIMEOUT)
+                    logger.info(f"Scan saw {len(seen)} device(s); found target {device.name} ({device.address})")
                     return device
-            
+                except asyncio.TimeoutError:
+                    logger.info(f"Scan saw {len(seen)} device(s); no target")
+
             if attempt < MAX_SCAN_ATTEMPTS - 1:
                 logger.warning(f"No target device found, retrying in {RETRY_DELAY} seconds...")
                 await asyncio.sleep(RETRY_DELAY)
-                
+
         except Exception as e:
             logger.error(f"Error during scan attempt {attempt + 1}: {e}")
             if attempt < MAX_SCAN_ATTEMPTS - 1:
@@ -120,50 +177,57 @@ async def scan_for_device():
 
 async def connect_with_retry(device, max_attempts=3):
     """Attempt to connect to the device with retries"""
+    # One client for all attempts: the backend proxy and its cached state
+    # survive a failed connect, so retries skip re-initialization. Limiting
+    # discovery to our service also spares walking the full GATT table.
+    client = BleakClient(device.address, timeout=CONNECTION_TIMEOUT,
+                         services=[SERVICE_UUID])
     for attempt in range(max_attempts):
         try:
             logger.info(f"Attempting to connect (attempt {attempt + 1}/{max_attempts})...")
-            client = BleakClient(device.address, timeout=CONNECTION_TIMEOUT)
             await client.connect()
             return client
         except BleakError as e:
             logger.error(f"Connection attempt {attempt + 1} failed: {e}")
             if attempt < max_attempts - 1:
-                logger.info(f"Retrying in {RETRY_DELAY} seconds...")
-                await asyncio.sleep(RETRY_DELAY)
+                logger.info("Backing off before reconnecting...")
+                await backoff(attempt)
             else:
                 raise
 
-async def read_characteristic_with_retry(client, char_uuid, description=""):
-    """Read a characteristic with retries"""
+async def read_characteristic_with_retry(client, char, description=""):
+    """Read a characteristic with retries.
+
+    Accepts a UUID string or a resolved BleakGATTCharacteristic."""
     for attempt in range(CHAR_OPERATION_RETRIES):
         try:
             if description:
                 logger.info(f"Reading {description}...")
-            value = await client.read_gatt_char(char_uuid)
+            value = await client.read_gatt_char(char)
             return value.decode('utf-8', errors='ignore')
         except BleakError as e:
             logger.error(f"Read attempt {attempt + 1} failed: {e}")
             if attempt < CHAR_OPERATION_RETRIES - 1:
-                wait_time = CHAR_OPERATION_DELAY * (attempt + 1)  # Increase delay with each retry
-                logger.info(f"Retrying read in {wait_time} seconds...")
-                await asyncio.sleep(wait_time)
+                logger.info("Backing off before retrying read...")
+                await backoff(attempt)
             else:
                 raise
 
-async def write_characteristic_with_retry(client, char_uuid, value, description=""):
-    """Write to a characteristic with retries"""
+async def write_characteristic_with_retry(client, char, value, description=""):
+    """Write to a characteristic with retries.
+
+    Accepts a UUID string or a resolved BleakGATTCharacteristic."""
     for attempt in range(CHAR_OPERATION_RETRIES):
         try:
             if description:
                 logger.info(f"Writing {description}...")
-            await client.write_gatt_char(char_uuid, value)
+            await client.write_gatt_char(char, value)
             return True
         except BleakError as e:
             logger.error(f"Write attempt {attempt + 1} failed: {e}")
             if attempt < CHAR_OPERATION_RETRIES - 1:
-                logger.info(f"Retrying write in {CHAR_OPERATION_DELAY} seconds...")
-                await asyncio.sleep(CHAR_OPERATION_DELAY)
+                logger.info("Backing off before retrying write...")
+                await backoff(attempt)
             else:
                 raise
 
@@ -175,48 +239,93 @@ async def interact_with_device(device):
         client = await connect_with_retry(device)
         logger.info(f"Connected to {device.name}")
         
-        # Wait for connection to stabilize
-        logger.info(f"Waiting {CONNECTION_STABILIZATION_DELAY} seconds for connection to stabilize...")
-        await asyncio.sleep(CONNECTION_STABILIZATION_DELAY)
-        
+        # Probe readiness instead of a blanket sleep: the first successful
+        # ATT read proves the link is usable, typically well inside the old
+        # fixed 2s wait (which now only bounds the probe)
+        deadline = asyncio.get_running_loop().time() + CONNECTION_STABILIZATION_DELAY
+        probe_attempt = 0
+        while True:
+            try:
+                await client.read_gatt_char(CHAR_READ_WRITE_UUID)
+                break
+            except BleakError:
+                if asyncio.get_running_loop().time() >= deadline:
+                    logger.warning("Device not responding to probe; continuing anyway")
+                    break
+                await backoff(probe_attempt, base=0.05, cap=0.4)
+                probe_attempt += 1
+
+        # Best-effort ATT MTU negotiation: a 23-byte MTU chops the scan
+        # payload into 20-byte chunks at one connection interval each.
+        # bleak exposes no portable exchange API, so poke the BlueZ
+        # backend's acquire helper when present and just log the result.
+        try:
+            backend = getattr(client, "_backend", None)
+            if backend is not None and hasattr(backend, "_acquire_mtu"):
+                await backend._acquire_mtu()
+            logger.info(f"ATT MTU: {client.mtu_size}")
+        except Exception as e:
+            logger.debug(f"MTU negotiation unavailable: {e}")
+
+        # Resolve characteristic handles once - bleak short-circuits the
+        # UUID-to-handle lookup when handed the characteristic object, so
+        # the ~7 GATT ops below skip a table scan each
+        services = client.services
+        rw_char = services.get_characteristic(CHAR_READ_WRITE_UUID) or CHAR_READ_WRITE_UUID
+        scan_char = services.get_characteristic(WIFI_SCAN_UUID) or WIFI_SCAN_UUID
+        ssid_char = services.get_characteristic(WIFI_SET_SSID_UUID) or WIFI_SET_SSID_UUID
+        psk_char = services.get_characteristic(WIFI_SET_PSK_UUID) or WIFI_SET_PSK_UUID
+        provision_char = services.get_characteristic(WIFI_PROVISION_UUID)
+
         # 1. Read initial value from Read/Write characteristic
         initial_value = await read_characteristic_with_retry(
             client, 
-            CHAR_READ_WRITE_UUID,
+            rw_char,
             "initial value from Read/Write characteristic"
         )
         logger.info(f"Initial value: {initial_value}")
-        
-        # Additional delay after initial read
-        logger.info("Waiting 2 seconds before starting WiFi scan...")
-        await asyncio.sleep(2)
-        
-        # 2. Trigger WiFi scan by reading the scan characteristic
-        logger.info("Triggering WiFi scan...")
+
+        # 2. Stream WiFi scan results over notifications. Subscribing kicks
+        # off the scan server-side; each notification carries one SSID and an
+        # empty payload marks end-of-scan, so we finish the moment the scan
+        # does instead of sleeping a fixed 10s and re-reading.
+        logger.info("Starting WiFi scan via notifications...")
         try:
-            # First read triggers the scan
-            logger.info("Triggering scan...")
+            scan_done = asyncio.Event()
+            ssids = []
+            scan_error = None
+
+            def on_scan_notify(_char, data):
+                nonlocal scan_error
+                if not data:
+                    scan_done.set()
+                elif data.startswith(b'{"error"'):
+                    # Server-side failure payload, not an SSID
+                    scan_error = data.decode('utf-8', errors='ignore')
+                else:
+                    ssids.append(data.decode('utf-8', errors='ignore'))
+
             try:
-                value = await client.read_gatt_char(WIFI_SCAN_UUID)
-                logger.info("Scan triggered successfully")
+                await client.start_notify(scan_char, on_scan_notify)
             except BleakError as e:
-                logger.error(f"Failed to trigger scan: {e}")
+                logger.error(f"Failed to subscribe to scan notifications: {e}")
                 return
-            
-            # Wait for scan to complete
-            logger.info("Waiting 10 seconds for WiFi scan to complete...")
-            await asyncio.sleep(10)
-            
-            # Now read the results
-            logger.info("Reading WiFi scan results...")
+
             try:
-                value = await client.read_gatt_char(WIFI_SCAN_UUID)
-                scan_results = value.decode('utf-8', errors='ignore')
-                logger.info(f"Scan results: {scan_results}")
-            except BleakError as e:
-                logger.error(f"Failed to read scan results: {e}")
-                return
-            
+                # WIFI_SCAN_WAIT is only the safety ceiling now
+                await asyncio.wait_for(scan_done.wait(), timeout=WIFI_SCAN_WAIT)
+            except asyncio.TimeoutError:
+                logger.warning("Scan stream timed out; continuing with results received so far")
+            finally:
+                try:
+                    await client.stop_notify(scan_char)
+                except BleakError:
+                    pass
+
+            if scan_error is not None:
+                logger.error(f"Server-side scan failed: {scan_error}")
+            logger.info(f"Scan results: {ssids}")
+
         except Exception as e:
             logger.error(f"Unexpected error during WiFi scan: {e}")
             return
@@ -225,24 +334,37 @@ async def interact_with_device(device):
         ssid = "YourWiFiSSID"
         psk = "YourWiFiPassword"
         
-        await write_characteristic_with_retry(
-            client,
-            WIFI_SET_SSID_UUID,
-            ssid.encode('utf-8'),
-            f"SSID: {ssid}"
-        )
-        
-        await write_characteristic_with_retry(
-            client,
-            WIFI_SET_PSK_UUID,
-            psk.encode('utf-8'),
-            f"PSK: {psk}"
-        )
+        if provision_char is not None:
+            # One batched write carries both credentials - half the ATT
+            # round trips of the separate SSID/PSK characteristics
+            await write_characteristic_with_retry(
+                client,
+                provision_char,
+                json.dumps({"ssid": ssid, "psk": psk}).encode('utf-8'),
+                f"provision payload for SSID: {ssid}"
+            )
+        else:
+            # Older firmware without the provision characteristic:
+            # independent writes, issued together so the ATT requests
+            # share adjacent connection intervals
+            await asyncio.gather(
+                write_characteristic_with_retry(
+                    client,
+                    ssid_char,
+                    ssid.encode('utf-8'),
+                    f"SSID: {ssid}"
+                ),
+                write_characteristic_with_retry(
+                    client,
+                    psk_char,
+                    psk.encode('utf-8'),
+                    f"PSK: {psk}"
+                ))
         
         # 5. Trigger connection
         await write_characteristic_with_retry(
             client,
-            CHAR_READ_WRITE_UUID,
+            rw_char,
             b'CONNECT',
             "CONNECT command to Read/Write characteristic"
         )
@@ -254,7 +376,7 @@ async def interact_with_device(device):
         # 6. Read final status
         final_status = await read_characteristic_with_retry(
             client,
-            CHAR_READ_WRITE_UUID,
+            rw_char,
             "final status"
         )
         logger.info(f"Final status: {final_status}")
@@ -272,6 +394,7 @@ async def interact_with_device(device):
                 logger.error(f"Error during disconnect: {e}")
 
 async def main():
+    request_low_latency_conn_params()
     device = await scan_for_device()
     if device:
         await interact_with_device(device)
@@ -2,54 +2,91 @@
 
 import sys
 import json
+import logging
 import subprocess
 import os
 import struct
 import tempfile
 
+# One module serves both the quiet production install and debugging: set
+# OPEN_IN_EDITOR_DEBUG to get trace output on stderr (stdout carries the
+# native-messaging protocol). Otherwise a NullHandler keeps every
+# log.debug call a cheap no-op level check.
+if os.environ.get('OPEN_IN_EDITOR_DEBUG'):
+    logging.basicConfig(level=logging.DEBUG, stream=sys.stderr,
+                        format='%(asctime)s %(levelname)s %(message)s')
+else:
+    logging.getLogger().addHandler(logging.NullHandler())
+log = logging.getLogger(__name__)
+
+# Compiled once so per-message sends skip struct's format-string lookup
+_HDR = struct.Struct('<I')
+
 def get_message_length():
-    raw_length = sys.stdin.buffer.read(4)
-    if not raw_length:
+    # readinto a preallocated buffer: no transient 4-byte object per message
+    header = bytearray(4)
+    if sys.stdin.buffer.readinto(header) != 4:
         sys.exit(0)
-    message_length = struct.unpack('<I', raw_length)[0]
-    return message_length
+    length = int.from_bytes(header, 'little')
+    log.debug("message length: %d", length)
+    return length
 
 def read_native_message(length):
-    message = sys.stdin.buffer.read(length)
-    decoded_message = message.decode('utf-8')
-    return decoded_message
+    # Fill one buffer sized from the header; loop in case the pipe hands
+    # the payload over in pieces
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    offset = 0
+    while offset < length:
+        read = sys.stdin.buffer.readinto(view[offset:])
+        if not read:
+            sys.exit(0)
+        offset += read
+    # json.loads accepts UTF-8 bytes directly; no need for a str copy
+    return buffer
 
 def send_native_message(message):
     encoded_content = json.dumps(message).encode('utf-8')
-    encoded_length = struct.pack('<I', len(encoded_content))
-    sys.stdout.buffer.write(encoded_length)
-    sys.stdout.buffer.write(encoded_content)
+    # Single write: header and body reach the pipe in one syscall instead
+    # of a 4-byte write followed by the payload
+    sys.stdout.buffer.write(_HDR.pack(len(encoded_content)) + encoded_content)
     sys.stdout.flush()
 
 def open_in_editor(text):
-    """Opens the given text in Vim in Alacritty using a temporary file and deletes the file afterwards."""
+    """Opens the given text in Vim in Alacritty using a temporary file.
+
+    Replies to the browser first, then replaces this process with a
+    small shell wrapper via os.execvp, so the idle interpreter does not
+    sit around for the whole editor session; the wrapper removes the
+    temp file once the editor exits."""
     terminal = 'alacritty'  # Replace with your preferred terminal if different
     editor = os.environ.get('EDITOR', 'vim')
     if 'vim' not in editor.lower():
         editor = 'vim'
-    
-    try:
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.txt') as tmp_file:
-            tmp_file.write(text)
-            temp_file_path = tmp_file.name
 
-        try:
-            vim_command = [terminal, '-e', editor, temp_file_path]
-            process = subprocess.Popen(vim_command)
-            process.wait()
-        finally:
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
+    # Raw fd write: one syscall for the whole payload, skipping the
+    # TextIOWrapper/BufferedWriter stack and its incremental UTF-8 encoder
+    fd, temp_file_path = tempfile.mkstemp(suffix='.txt')
+    try:
+        os.write(fd, text.encode('utf-8'))
+    finally:
+        os.close(fd)
 
-        return f"Text has been opened in {editor} via {terminal}."
+    # After execvp there is no Python left to answer the browser, so the
+    # reply has to be on the wire before the handoff
+    send_native_message({"result": f"Text has been opened in {editor} via {terminal}."})
 
-    except Exception as e:
-        return f"Error opening editor: {str(e)}"
+    # The shell wrapper keeps the single-process handoff while restoring
+    # the cleanup the Python parent used to do after Popen.wait()
+    wrapper = ['sh', '-c', '"$1" -e "$2" "$3"; rm -f -- "$3"',
+               'sh', terminal, editor, temp_file_path]
+    log.debug("handing off to: %s", wrapper)
+    try:
+        os.execvp('sh', wrapper)
+    except OSError:
+        # exec failed; fall back to a detached child (which still owns
+        # the cleanup) and let this process exit normally
+        subprocess.Popen(wrapper, start_new_session=True)
 
 def main():
     try:
@@ -57,13 +94,11 @@ def main():
         if message_length <= 0:
             sys.exit(1)
 
-        message_json = read_native_message(message_length)
-        message = json.loads(message_json)
+        message = json.loads(read_native_message(message_length))
 
         if 'text' in message:
             text = message['text']
-            response_message = open_in_editor(text)
-            send_native_message({"result": response_message})
+            open_in_editor(text)
         else:
             error_msg = "No text received."
             send_native_message({"status": "error", "message": error_msg})